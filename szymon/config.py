@@ -0,0 +1,48 @@
+"""Application settings (loaded from `.env` via pydantic-settings)."""
+
+import os
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+CERTS_DIR = os.path.join(ROOT_DIR, "certs")
+CERTS_STAMP = os.path.join(CERTS_DIR, ".ok")
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(extra="ignore", env_file=".env")
+
+    app_name: str = "szymon"
+    debug: bool = False
+    reload: bool = Field(default=False, validation_alias="SZYMON_RELOAD")
+    host: str = "0.0.0.0"
+    port: int = 2137
+    workers: int = 1
+    frontend_url: str = "http://localhost:5173"
+
+    # Google Tasks API
+    google_client_id: Optional[str] = None
+    google_client_secret: Optional[str] = None
+
+    @cached_property
+    def ssl_certfile(self) -> str:
+        return os.path.join(CERTS_DIR, "cert.pem")
+
+    @cached_property
+    def ssl_keyfile(self) -> str:
+        return os.path.join(CERTS_DIR, "key.pem")
+
+    @cached_property
+    def google_token_path(self) -> Path:
+        return Path(ROOT_DIR, ".google_token.json")
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Get application settings, parsed from the environment once per process."""
+    return Settings()
@@ -0,0 +1,10 @@
+"""Shared exception types."""
+
+from fastapi import HTTPException
+
+
+class ServiceError(HTTPException):
+    """Error raised by routes when a backing service fails or is unavailable."""
+
+    def __init__(self, detail: str, status_code: int = 500):
+        super().__init__(status_code=status_code, detail=detail)
@@ -1,54 +1,30 @@
+import hashlib
 import logging
+import os
+import shutil
 import socket
 import subprocess
-from pathlib import Path
 from typing import Optional
 
 import uvicorn
 from fastapi import FastAPI, Request
-from fastapi.responses import FileResponse, JSONResponse
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 
 logger = logging.getLogger(__name__)
 
+from szymon.config import ASSETS_DIR, CERTS_DIR, CERTS_STAMP, get_settings
+from szymon.errors import ServiceError
 from szymon.routers import calendar as calendar_router
 from szymon.routers import tasks as tasks_router
 from szymon.services.google_auth import GoogleAuthService
 from szymon.services.google_calendar import GoogleCalendarService
 from szymon.services.google_tasks import GoogleTasksService
 
-ROOT_DIR = Path(__file__).parent.parent
-ASSETS_DIR = ROOT_DIR / "assets"
-CERTS_DIR = ROOT_DIR / "certs"
+settings = get_settings()
 
-
-class Settings(BaseSettings):
-    model_config = SettingsConfigDict(extra="ignore", env_file=".env")
-
-    app_name: str = "szymon"
-    debug: bool = True
-    host: str = "0.0.0.0"
-    port: int = 2137
-    frontend_url: str = "http://localhost:5173"
-
-    # Google Tasks API
-    google_client_id: Optional[str] = None
-    google_client_secret: Optional[str] = None
-
-    @property
-    def ssl_certfile(self) -> Path:
-        return CERTS_DIR / "cert.pem"
-
-    @property
-    def ssl_keyfile(self) -> Path:
-        return CERTS_DIR / "key.pem"
-
-    @property
-    def google_token_path(self) -> Path:
-        return ROOT_DIR / ".google_token.json"
-
-
-settings = Settings()
+# Names the dev certificate is valid for, besides the machine's hostname
+CERT_HOSTS = ("localhost", "127.0.0.1", "::1", "0.0.0.0")
 
 
 def _init_google_auth() -> Optional[GoogleAuthService]:
@@ -80,31 +56,44 @@ def _init_google_calendar(auth: Optional[GoogleAuthService]) -> Optional[GoogleC
 
 # Initialize services and routers
 _google_auth = _init_google_auth()
-tasks_router.init_service(_init_google_tasks(_google_auth), settings.frontend_url)
-calendar_router.init_service(_init_google_calendar(_google_auth), settings.frontend_url)
+_google_tasks = _init_google_tasks(_google_auth)
+_google_calendar = _init_google_calendar(_google_auth)
+tasks_router.init_service(_google_tasks, settings.frontend_url)
+calendar_router.init_service(_google_calendar, settings.frontend_url)
 
 
 def ensure_certs():
     """Generate SSL certificates with mkcert if they don't exist."""
-    if settings.ssl_certfile.exists() and settings.ssl_keyfile.exists():
+    # Stamp is written once both files are known to exist, so later starts need a single stat
+    if os.path.exists(CERTS_STAMP):
         return
+    try:
+        os.stat(settings.ssl_certfile)
+        os.stat(settings.ssl_keyfile)
+    except FileNotFoundError:
+        _generate_certs()
+    open(CERTS_STAMP, "w").close()
+
 
-    CERTS_DIR.mkdir(parents=True, exist_ok=True)
+def _generate_certs():
+    """Run mkcert to create the certificate and key files."""
+    mkcert = shutil.which("mkcert")
+    if mkcert is None:
+        raise RuntimeError("mkcert not found on PATH. Install it to generate SSL certificates.")
+
+    os.makedirs(CERTS_DIR, exist_ok=True)
     print("Generating SSL certificates with mkcert...")
-    hostname = socket.gethostname()
     subprocess.run(
         [
-            "mkcert",
+            mkcert,
             "-cert-file",
-            str(settings.ssl_certfile),
+            settings.ssl_certfile,
             "-key-file",
-            str(settings.ssl_keyfile),
-            "localhost",
-            "127.0.0.1",
-            "::1",
-            "0.0.0.0",
-            hostname,
+            settings.ssl_keyfile,
+            *CERT_HOSTS,
+            socket.gethostname(),
         ],
+        stdin=subprocess.DEVNULL,
         check=True,
     )
 
@@ -112,8 +101,22 @@ def ensure_certs():
 app = FastAPI(
     title=settings.app_name,
     description="Personal assistant - gateway for personal APIs and tools",
+    default_response_class=ORJSONResponse,
 )
 
+# Level 1 is much cheaper than the default 6 and still roughly halves JSON payloads
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
+
+
+@app.exception_handler(ServiceError)
+async def service_exception_handler(request: Request, exc: ServiceError):
+    """Return service errors with their status code and detail."""
+    logger.warning(f"Service error on {request.method} {request.url.path}: {exc.detail}")
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+    )
+
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -130,9 +133,17 @@ app.include_router(tasks_router.router)
 app.include_router(calendar_router.router)
 
 
+with open(os.path.join(ASSETS_DIR, "favicon.gif"), "rb") as _favicon_file:
+    _FAVICON_BYTES = _favicon_file.read()
+_FAVICON_HEADERS = {
+    "Cache-Control": "public, max-age=31536000, immutable",
+    "ETag": f'"{hashlib.md5(_FAVICON_BYTES).hexdigest()}"',
+}
+
+
 @app.get("/favicon.ico", include_in_schema=False)
 def favicon():
-    return FileResponse(ASSETS_DIR / "favicon.gif", media_type="image/gif")
+    return Response(content=_FAVICON_BYTES, media_type="image/gif", headers=_FAVICON_HEADERS)
 
 
 @app.get("/health")
@@ -147,10 +158,11 @@ def main():
         "szymon.main:app",
         host=settings.host,
         port=settings.port,
-        reload=settings.debug,
+        reload=settings.reload,
+        workers=settings.workers,
         log_level="info",
-        ssl_certfile=str(settings.ssl_certfile),
-        ssl_keyfile=str(settings.ssl_keyfile),
+        ssl_certfile=settings.ssl_certfile,
+        ssl_keyfile=settings.ssl_keyfile,
     )
 
 
@@ -1,10 +1,11 @@
 """Google Calendar API routes."""
 
-from typing import Optional
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse
 
+from szymon.errors import ServiceError
 from szymon.services.google_calendar import GoogleCalendarService, EventCreate, EventUpdate
 
 router = APIRouter(prefix="/api/calendar", tags=["calendar"])
@@ -13,6 +14,8 @@ router = APIRouter(prefix="/api/calendar", tags=["calendar"])
 _service: Optional[GoogleCalendarService] = None
 _frontend_url: str = "http://localhost:5173"
 
+_AUTH_FAILED_HTML = "<html><body><h1>Authentication failed</h1><p>%s</p></body></html>"
+
 
 def init_service(service: Optional[GoogleCalendarService], frontend_url: str = "http://localhost:5173") -> None:
     """Initialize the Google Calendar service. Called from main.py."""
@@ -21,16 +24,20 @@ def init_service(service: Optional[GoogleCalendarService], frontend_url: str = "
     _frontend_url = frontend_url
 
 
-def _require_service() -> GoogleCalendarService:
-    """Helper to check if Google Calendar is configured."""
+def get_service() -> GoogleCalendarService:
+    """Dependency returning the Google Calendar service, or 503 if not configured."""
     if _service is None:
-        raise HTTPException(
+        raise ServiceError(
+            "Google Calendar not configured. Set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET in .env",
             status_code=503,
-            detail="Google Calendar not configured. Set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET in .env",
         )
     return _service
 
 
+CalendarId = Annotated[str, Query()]
+CalendarService = Annotated[GoogleCalendarService, Depends(get_service)]
+
+
 @router.get("/auth/status")
 def auth_status():
     """Check if Google Calendar is authenticated."""
@@ -40,101 +47,80 @@ def auth_status():
 
 
 @router.get("/auth/login")
-def auth_login():
+def auth_login(service: CalendarService):
     """Redirect to Google OAuth login."""
-    service = _require_service()
     url, state = service.get_auth_url()
     return RedirectResponse(url=url)
 
 
 @router.get("/auth/callback")
-def auth_callback(code: str, state: Optional[str] = None):
+def auth_callback(
+    service: CalendarService,
+    code: Annotated[str, Query()],
+    state: Annotated[Optional[str], Query()] = None,
+):
     """OAuth callback - exchange code for tokens."""
-    service = _require_service()
     try:
         service.exchange_code(code)
         return RedirectResponse(url=f"{_frontend_url}/calendar")
     except Exception as e:
         return HTMLResponse(
-            content=f"<html><body><h1>Authentication failed</h1><p>{e}</p></body></html>",
+            content=_AUTH_FAILED_HTML % e,
             status_code=400,
         )
 
 
-@router.get("/calendars")
-def list_calendars():
+@router.get("/calendars", response_model=None)
+def list_calendars(service: CalendarService):
     """List all calendars."""
-    service = _require_service()
-    try:
-        return service.list_calendars()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(service.list_calendars())
 
 
-@router.get("/events")
+@router.get("/events", response_model=None)
 def list_events(
-    calendar_id: str = "primary",
-    time_min: Optional[str] = None,
-    time_max: Optional[str] = None,
+    service: CalendarService,
+    calendar_id: CalendarId = "primary",
+    time_min: Annotated[Optional[str], Query()] = None,
+    time_max: Annotated[Optional[str], Query()] = None,
+    fields: Annotated[str, Query()] = GoogleCalendarService.DEFAULT_EVENT_FIELDS,
 ):
-    """List events in a calendar."""
-    service = _require_service()
-    try:
-        return service.list_events(
+    """List events in a calendar. Pass `fields=*` for full event resources."""
+    return ORJSONResponse(
+        service.list_events(
             calendar_id=calendar_id,
             time_min=time_min,
             time_max=time_max,
+            fields=fields,
         )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    )
 
 
-@router.get("/events/{event_id}")
-def get_event(event_id: str, calendar_id: str = "primary"):
+@router.get("/events/{event_id}", response_model=None)
+def get_event(service: CalendarService, event_id: str, calendar_id: CalendarId = "primary"):
     """Get a specific event."""
-    service = _require_service()
-    try:
-        return service.get_event(event_id, calendar_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(service.get_event(event_id, calendar_id))
 
 
-@router.post("/events")
-def create_event(event: EventCreate, calendar_id: str = "primary"):
+@router.post("/events", response_model=None)
+def create_event(service: CalendarService, event: EventCreate, calendar_id: CalendarId = "primary"):
     """Create a new event."""
-    service = _require_service()
-    try:
-        return service.create_event(event, calendar_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(service.create_event(event, calendar_id))
 
 
-@router.post("/events/quick")
-def quick_add_event(text: str, calendar_id: str = "primary"):
+@router.post("/events/quick", response_model=None)
+def quick_add_event(service: CalendarService, text: Annotated[str, Query()], calendar_id: CalendarId = "primary"):
     """Create an event using natural language."""
-    service = _require_service()
-    try:
-        return service.quick_add(text, calendar_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(service.quick_add(text, calendar_id))
 
 
-@router.put("/events/{event_id}")
-def update_event(event_id: str, event: EventUpdate, calendar_id: str = "primary"):
+@router.put("/events/{event_id}", response_model=None)
+def update_event(service: CalendarService, event_id: str, event: EventUpdate, calendar_id: CalendarId = "primary"):
     """Update an existing event."""
-    service = _require_service()
-    try:
-        return service.update_event(event_id, event, calendar_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(service.update_event(event_id, event, calendar_id))
 
 
 @router.delete("/events/{event_id}")
-def delete_event(event_id: str, calendar_id: str = "primary"):
+def delete_event(service: CalendarService, event_id: str, calendar_id: CalendarId = "primary"):
     """Delete an event."""
-    service = _require_service()
-    try:
-        service.delete_event(event_id, calendar_id)
-        return {"status": "deleted"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    service.delete_event(event_id, calendar_id)
+    return {"status": "deleted"}
@@ -1,10 +1,11 @@
 """Google Tasks API routes."""
 
-from typing import Optional
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse
 
+from szymon.errors import ServiceError
 from szymon.services.google_tasks import GoogleTasksService, TaskCreate, TaskUpdate
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
@@ -13,6 +14,8 @@ router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 _service: Optional[GoogleTasksService] = None
 _frontend_url: str = "http://localhost:5173"
 
+_AUTH_FAILED_HTML = "<html><body><h1>Authentication failed</h1><p>%s</p></body></html>"
+
 
 def init_service(service: Optional[GoogleTasksService], frontend_url: str = "http://localhost:5173") -> None:
     """Initialize the Google Tasks service. Called from main.py."""
@@ -21,16 +24,20 @@ def init_service(service: Optional[GoogleTasksService], frontend_url: str = "htt
     _frontend_url = frontend_url
 
 
-def _require_service() -> GoogleTasksService:
-    """Helper to check if Google Tasks is configured."""
+def get_service() -> GoogleTasksService:
+    """Dependency returning the Google Tasks service, or 503 if not configured."""
     if _service is None:
-        raise HTTPException(
+        raise ServiceError(
+            "Google Tasks not configured. Set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET in .env",
             status_code=503,
-            detail="Google Tasks not configured. Set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET in .env",
         )
     return _service
 
 
+TaskListId = Annotated[str, Query()]
+TasksService = Annotated[GoogleTasksService, Depends(get_service)]
+
+
 @router.get("/auth/status")
 def auth_status():
     """Check if Google Tasks is authenticated."""
@@ -40,103 +47,86 @@ def auth_status():
 
 
 @router.get("/auth/login")
-def auth_login():
+def auth_login(service: TasksService):
     """Redirect to Google OAuth login."""
-    service = _require_service()
     url, state = service.get_auth_url()
     return RedirectResponse(url=url)
 
 
 @router.get("/auth/callback")
-def auth_callback(code: str, state: Optional[str] = None):
+def auth_callback(
+    service: TasksService,
+    code: Annotated[str, Query()],
+    state: Annotated[Optional[str], Query()] = None,
+):
     """OAuth callback - exchange code for tokens."""
-    service = _require_service()
     try:
         service.exchange_code(code)
         return RedirectResponse(url=_frontend_url)
     except Exception as e:
         return HTMLResponse(
-            content=f"<html><body><h1>Authentication failed</h1><p>{e}</p></body></html>",
+            content=_AUTH_FAILED_HTML % e,
             status_code=400,
         )
 
 
-@router.get("/lists")
-def list_task_lists():
+@router.get("/lists", response_model=None)
+def list_task_lists(service: TasksService):
     """List all task lists."""
-    service = _require_service()
-    try:
-        return service.list_task_lists()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get("")
-def list_tasks(task_list_id: str = "@default", show_completed: bool = True, show_hidden: bool = True):
-    """List all tasks in a task list."""
-    service = _require_service()
-    try:
-        return service.list_tasks(task_list_id=task_list_id, show_completed=show_completed, show_hidden=show_hidden)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(service.list_task_lists())
+
+
+@router.get("", response_model=None)
+def list_tasks(
+    service: TasksService,
+    task_list_id: TaskListId = "@default",
+    show_completed: Annotated[bool, Query()] = True,
+    show_hidden: Annotated[bool, Query()] = True,
+    fields: Annotated[str, Query()] = GoogleTasksService.DEFAULT_TASK_FIELDS,
+):
+    """List all tasks in a task list. Pass `fields=*` for full task resources."""
+    return ORJSONResponse(
+        service.list_tasks(
+            task_list_id=task_list_id,
+            show_completed=show_completed,
+            show_hidden=show_hidden,
+            fields=fields,
+        )
+    )
 
 
-@router.get("/{task_id}")
-def get_task(task_id: str, task_list_id: str = "@default"):
+@router.get("/{task_id}", response_model=None)
+def get_task(service: TasksService, task_id: str, task_list_id: TaskListId = "@default"):
     """Get a specific task."""
-    service = _require_service()
-    try:
-        return service.get_task(task_id, task_list_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(service.get_task(task_id, task_list_id))
 
 
-@router.post("")
-def create_task(task: TaskCreate, task_list_id: str = "@default"):
+@router.post("", response_model=None)
+def create_task(service: TasksService, task: TaskCreate, task_list_id: TaskListId = "@default"):
     """Create a new task."""
-    service = _require_service()
-    try:
-        return service.create_task(task, task_list_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(service.create_task(task, task_list_id))
 
 
-@router.put("/{task_id}")
-def update_task(task_id: str, task: TaskUpdate, task_list_id: str = "@default"):
+@router.put("/{task_id}", response_model=None)
+def update_task(service: TasksService, task_id: str, task: TaskUpdate, task_list_id: TaskListId = "@default"):
     """Update an existing task."""
-    service = _require_service()
-    try:
-        return service.update_task(task_id, task, task_list_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(service.update_task(task_id, task, task_list_id))
 
 
 @router.delete("/{task_id}")
-def delete_task(task_id: str, task_list_id: str = "@default"):
+def delete_task(service: TasksService, task_id: str, task_list_id: TaskListId = "@default"):
     """Delete a task."""
-    service = _require_service()
-    try:
-        service.delete_task(task_id, task_list_id)
-        return {"status": "deleted"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    service.delete_task(task_id, task_list_id)
+    return {"status": "deleted"}
 
 
-@router.post("/{task_id}/complete")
-def complete_task(task_id: str, task_list_id: str = "@default"):
+@router.post("/{task_id}/complete", response_model=None)
+def complete_task(service: TasksService, task_id: str, task_list_id: TaskListId = "@default"):
     """Mark a task as completed."""
-    service = _require_service()
-    try:
-        return service.complete_task(task_id, task_list_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(service.complete_task(task_id, task_list_id))
 
 
-@router.post("/{task_id}/uncomplete")
-def uncomplete_task(task_id: str, task_list_id: str = "@default"):
+@router.post("/{task_id}/uncomplete", response_model=None)
+def uncomplete_task(service: TasksService, task_id: str, task_list_id: TaskListId = "@default"):
     """Mark a task as not completed."""
-    service = _require_service()
-    try:
-        return service.uncomplete_task(task_id, task_list_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(service.uncomplete_task(task_id, task_list_id))
@@ -1,21 +1,41 @@
 """Shared Google OAuth authentication module."""
 
+import os
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
+import orjson
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+    from google_auth_httplib2 import AuthorizedHttp
+    from google_auth_oauthlib.flow import Flow
 
 # Combined scopes for all Google services
-SCOPES = [
+SCOPES = (
     "https://www.googleapis.com/auth/tasks",
     "https://www.googleapis.com/auth/calendar.events",
-]
+)
+
+_AUTH_URI = "https://accounts.google.com/o/oauth2/auth"
+_TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+# Socket timeout (seconds) for the per-thread Google API transports
+HTTP_TIMEOUT = 10
+
+
+def _is_usable(creds: "Credentials") -> bool:
+    """Whether credentials are valid now or can be refreshed."""
+    return bool(creds.valid or (creds.expired and creds.refresh_token))
 
 
 class GoogleAuthService:
     """Shared OAuth service for Google APIs."""
 
+    # Token directories already created in this process
+    _dir_created: set[Path] = set()
+
     def __init__(
         self,
         client_id: str,
@@ -27,66 +47,155 @@ class GoogleAuthService:
         self.client_secret = client_secret
         self.token_path = token_path
         self.redirect_uri = redirect_uri
-
-    def _get_client_config(self) -> dict:
-        """Get OAuth client configuration."""
-        return {
+        self._client_config = {
             "web": {
-                "client_id": self.client_id,
-                "client_secret": self.client_secret,
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
-                "redirect_uris": [self.redirect_uri],
+                "client_id": client_id,
+                "client_secret": client_secret,
+                "auth_uri": _AUTH_URI,
+                "token_uri": _TOKEN_URI,
+                "redirect_uris": [redirect_uri],
             }
         }
-
-    def _get_flow(self) -> Flow:
+        self._creds: Optional["Credentials"] = None
+        self._lock = threading.Lock()
+        self._last_written_json: Optional[str] = None
+        # httplib2.Http is not thread-safe, so each thread gets its own transport
+        self._local = threading.local()
+        self._clients: dict[tuple[str, str], object] = {}
+        self._reauth_callbacks: list[Callable[[], None]] = []
+
+    def _get_flow(self) -> "Flow":
         """Create OAuth flow."""
+        from google_auth_oauthlib.flow import Flow
+
         return Flow.from_client_config(
-            self._get_client_config(),
+            self._client_config,
             scopes=SCOPES,
             redirect_uri=self.redirect_uri,
         )
 
-    def get_credentials(self) -> Credentials:
+    def add_reauth_callback(self, callback: Callable[[], None]) -> None:
+        """Register a callback run after exchange_code installs new credentials."""
+        self._reauth_callbacks.append(callback)
+
+    def get_credentials(self) -> "Credentials":
         """Get or refresh OAuth2 credentials."""
-        creds = None
+        creds = self._creds
+        if creds is not None and creds.valid:
+            return creds
 
-        if self.token_path.exists():
-            creds = Credentials.from_authorized_user_file(str(self.token_path), SCOPES)
+        from google.auth.transport.requests import Request
 
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-                self._save_credentials(creds)
-            else:
-                raise Exception("Not authenticated. Visit /api/auth/login to authenticate.")
+        with self._lock:
+            creds = self._creds
+            if creds is None and self.token_path.exists():
+                creds = self._load_credentials()
 
-        return creds
+            if not creds or not creds.valid:
+                if creds and creds.expired and creds.refresh_token:
+                    creds.refresh(Request())
+                    self._save_credentials(creds)
+                else:
+                    raise Exception("Not authenticated. Visit /api/auth/login to authenticate.")
 
-    def _save_credentials(self, creds: Credentials):
-        """Save credentials to token file."""
-        self.token_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.token_path, "w") as token:
-            token.write(creds.to_json())
+            self._creds = creds
+        return creds
 
-    def exchange_code(self, code: str) -> Credentials:
+    def get_http(self) -> "AuthorizedHttp":
+        """Get this thread's authorized HTTP transport, shared by all Google API clients.
+
+        Pass it to every request's execute(http=...). Worker threads are pooled,
+        so each keeps its keep-alive connections across calls.
+        """
+        creds = self.get_credentials()
+        http = getattr(self._local, "http", None)
+        # Rebuild after exchange_code replaces the credentials object
+        if http is None or http.credentials is not creds:
+            import httplib2
+            from google_auth_httplib2 import AuthorizedHttp
+
+            http = AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+            self._local.http = http
+        return http
+
+    def build_service(self, api: str, version: str):
+        """Get a cached Google API client. Requests must execute with get_http()."""
+        client = self._clients.get((api, version))
+        if client is None:
+            from googleapiclient.discovery import build
+
+            # Bundled discovery documents; no network fetch to build the client
+            client = build(api, version, http=self.get_http(), cache_discovery=False, static_discovery=True)
+            self._clients[(api, version)] = client
+        return client
+
+    def _load_credentials(self) -> "Credentials":
+        """Load credentials from the token file."""
+        from google.oauth2.credentials import Credentials
+
+        with open(self.token_path, "rb") as token:
+            info = orjson.loads(token.read())
+        return Credentials.from_authorized_user_info(info, SCOPES)
+
+    def _save_credentials(self, creds: "Credentials"):
+        """Save credentials to token file atomically, skipping unchanged writes.
+
+        Callers must hold self._lock.
+        """
+        data = creds.to_json()
+        if data == self._last_written_json:
+            return
+
+        parent = self.token_path.parent
+        if parent not in self._dir_created:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._dir_created.add(parent)
+
+        # Owner-only from creation, fully written and synced, then swapped in
+        tmp_path = self.token_path.with_suffix(".tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.fchmod(fd, 0o600)  # in case a stale .tmp survived a crash with other perms
+            view = memoryview(data.encode())
+            while view:
+                # os.write may write fewer bytes than asked
+                view = view[os.write(fd, view) :]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, self.token_path)
+        self._last_written_json = data
+
+    def exchange_code(self, code: str) -> "Credentials":
         """Exchange authorization code for credentials."""
         flow = self._get_flow()
         flow.fetch_token(code=code)
         creds = flow.credentials
-        self._save_credentials(creds)
+        # Same lock as the refresh path, so the tmp file and the token on disk follow memory
+        with self._lock:
+            self._save_credentials(creds)
+            self._creds = creds
+            self._clients.clear()
+        # Possibly a different account, so drop anything cached for the old one
+        for callback in self._reauth_callbacks:
+            callback()
         return creds
 
     def is_authenticated(self) -> bool:
         """Check if valid credentials exist."""
+        creds = self._creds
+        if creds is not None:
+            return _is_usable(creds)
         if not self.token_path.exists():
             return False
         try:
-            creds = Credentials.from_authorized_user_file(str(self.token_path), SCOPES)
-            return creds.valid or (creds.expired and creds.refresh_token)
+            creds = self._load_credentials()
         except Exception:
             return False
+        with self._lock:
+            if self._creds is None:
+                self._creds = creds
+        return _is_usable(creds)
 
     def get_auth_url(self) -> tuple[str, str]:
         """Get the OAuth authorization URL. Returns (url, state)."""
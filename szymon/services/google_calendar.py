@@ -1,15 +1,19 @@
 """Google Calendar API service with CRUD operations."""
 
-from datetime import datetime, timedelta
-from typing import Optional
-
-from googleapiclient.discovery import build
-from pydantic import BaseModel
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
 
 from szymon.services.google_auth import GoogleAuthService
+from szymon.services.list_cache import ListCache
+
+# The Calendar API accepts at most 50 calls per batch request
+BATCH_LIMIT = 50
 
 
-class EventCreate(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class EventCreate:
     summary: str
     description: Optional[str] = None
     location: Optional[str] = None
@@ -18,7 +22,8 @@ class EventCreate(BaseModel):
     timezone: str = "UTC"
 
 
-class EventUpdate(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class EventUpdate:
     summary: Optional[str] = None
     description: Optional[str] = None
     location: Optional[str] = None
@@ -30,16 +35,41 @@ class EventUpdate(BaseModel):
 class GoogleCalendarService:
     """Service for interacting with Google Calendar API."""
 
-    def __init__(self, auth_service: GoogleAuthService):
+    # Partial response covering what the web UI reads from an event list
+    DEFAULT_EVENT_FIELDS = "items(id,summary,description,location,start,end,status,htmlLink),nextPageToken"
+
+    def __init__(self, auth_service: GoogleAuthService, list_cache_ttl: float = 20):
         self.auth = auth_service
+        # Recent list_events results, cleared by any event mutation or re-auth; ttl of 0 disables it
+        self._list_cache = ListCache(ttl=list_cache_ttl)
+        auth_service.add_reauth_callback(self._list_cache.clear)
         self._service = None
+        self._events = None
+        self._calendar_list = None
 
     def _get_service(self):
-        """Get or create the Calendar API service."""
-        if self._service is None:
-            creds = self.auth.get_credentials()
-            self._service = build("calendar", "v3", credentials=creds)
-        return self._service
+        """Get the Calendar API service (cached on the auth service)."""
+        service = self.auth.build_service("calendar", "v3")
+        # Resource collections are rebuilt only when the client itself changes
+        if service is not self._service:
+            self._events = service.events()
+            self._calendar_list = service.calendarList()
+            self._service = service
+        return service
+
+    def _get_events(self):
+        """Get the events() collection of the current API service."""
+        self._get_service()
+        return self._events
+
+    def _get_calendar_list(self):
+        """Get the calendarList() collection of the current API service."""
+        self._get_service()
+        return self._calendar_list
+
+    def _execute(self, request):
+        """Execute an API request on this thread's transport."""
+        return request.execute(http=self.auth.get_http())
 
     def is_authenticated(self) -> bool:
         """Check if valid credentials exist."""
@@ -57,8 +87,7 @@ class GoogleCalendarService:
 
     def list_calendars(self) -> list[dict]:
         """List all calendars the user has access to."""
-        service = self._get_service()
-        results = service.calendarList().list().execute()
+        results = self._execute(self._get_calendar_list().list())
         return results.get("items", [])
 
     # Events CRUD
@@ -69,41 +98,72 @@ class GoogleCalendarService:
         time_min: Optional[str] = None,
         time_max: Optional[str] = None,
         max_results: int = 250,
+        fields: Optional[str] = None,
     ) -> list[dict]:
-        """List events in a calendar within the given time range."""
-        service = self._get_service()
+        """List events in a calendar within the given time range.
+
+        Pass `fields` (e.g. DEFAULT_EVENT_FIELDS) to request a partial response.
+        """
+        key = (calendar_id, time_min, time_max, max_results, fields)
+        items = self._list_cache.get(key)
+        if items is None:
+            request = self._list_events_request(calendar_id, time_min, time_max, max_results, fields)
+            items = self._execute(request).get("items", [])
+            self._list_cache.set(key, items)
+        return items
 
+    def iter_events(
+        self,
+        calendar_id: str = "primary",
+        time_min: Optional[str] = None,
+        time_max: Optional[str] = None,
+        page_size: int = 250,
+        fields: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """Yield all events in the time range, fetching further pages lazily.
+
+        A custom `fields` projection must include nextPageToken.
+        """
+        events = self._get_events()
+        request = self._list_events_request(calendar_id, time_min, time_max, page_size, fields)
+        while request is not None:
+            response = self._execute(request)
+            yield from response.get("items", [])
+            request = events.list_next(request, response)
+
+    def _list_events_request(
+        self,
+        calendar_id: str,
+        time_min: Optional[str],
+        time_max: Optional[str],
+        max_results: int,
+        fields: Optional[str],
+    ):
+        """Build an events().list request, defaulting to the current week."""
         # Default to current week if no time range specified
-        if time_min is None:
-            now = datetime.utcnow()
-            time_min = now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat() + "Z"
-        if time_max is None:
-            now = datetime.utcnow()
-            week_end = now + timedelta(days=7)
-            time_max = week_end.replace(hour=23, minute=59, second=59, microsecond=0).isoformat() + "Z"
-
-        results = (
-            service.events()
-            .list(
-                calendarId=calendar_id,
-                timeMin=time_min,
-                timeMax=time_max,
-                maxResults=max_results,
-                singleEvents=True,  # Expand recurring events
-                orderBy="startTime",
-            )
-            .execute()
+        if time_min is None or time_max is None:
+            now = datetime.now(timezone.utc)
+            if time_min is None:
+                time_min = f"{now:%Y-%m-%d}T00:00:00Z"
+            if time_max is None:
+                time_max = f"{now + timedelta(days=7):%Y-%m-%d}T23:59:59Z"
+
+        return self._get_events().list(
+            calendarId=calendar_id,
+            timeMin=time_min,
+            timeMax=time_max,
+            maxResults=max_results,
+            singleEvents=True,  # Expand recurring events
+            orderBy="startTime",
+            fields=fields,
         )
-        return results.get("items", [])
 
     def get_event(self, event_id: str, calendar_id: str = "primary") -> dict:
         """Get a specific event by ID."""
-        service = self._get_service()
-        return service.events().get(calendarId=calendar_id, eventId=event_id).execute()
+        return self._execute(self._get_events().get(calendarId=calendar_id, eventId=event_id))
 
     def create_event(self, event: EventCreate, calendar_id: str = "primary") -> dict:
         """Create a new event."""
-        service = self._get_service()
         body = {
             "summary": event.summary,
             "start": {
@@ -120,44 +180,125 @@ class GoogleCalendarService:
         if event.location:
             body["location"] = event.location
 
-        return service.events().insert(calendarId=calendar_id, body=body).execute()
+        created = self._execute(self._get_events().insert(calendarId=calendar_id, body=body))
+        self._list_cache.clear()
+        return created
 
     def update_event(
         self, event_id: str, event: EventUpdate, calendar_id: str = "primary"
     ) -> dict:
-        """Update an existing event."""
-        service = self._get_service()
-        existing = self.get_event(event_id, calendar_id)
+        """Update an existing event, sending only the changed fields."""
+        body = {}
 
         if event.summary is not None:
-            existing["summary"] = event.summary
+            body["summary"] = event.summary
         if event.description is not None:
-            existing["description"] = event.description
+            body["description"] = event.description
         if event.location is not None:
-            existing["location"] = event.location
+            body["location"] = event.location
+        # PATCH merges nested objects: an omitted timeZone keeps the event's current one,
+        # and date must be nulled so an all-day event can become a timed one
         if event.start_datetime is not None:
-            existing["start"] = {
-                "dateTime": event.start_datetime,
-                "timeZone": event.timezone or existing.get("start", {}).get("timeZone", "UTC"),
-            }
+            body["start"] = {"dateTime": event.start_datetime, "date": None}
+            if event.timezone:
+                body["start"]["timeZone"] = event.timezone
         if event.end_datetime is not None:
-            existing["end"] = {
-                "dateTime": event.end_datetime,
-                "timeZone": event.timezone or existing.get("end", {}).get("timeZone", "UTC"),
-            }
+            body["end"] = {"dateTime": event.end_datetime, "date": None}
+            if event.timezone:
+                body["end"]["timeZone"] = event.timezone
 
-        return (
-            service.events()
-            .update(calendarId=calendar_id, eventId=event_id, body=existing)
-            .execute()
-        )
+        if not body:
+            return self.get_event(event_id, calendar_id)
+
+        updated = self._execute(self._get_events().patch(calendarId=calendar_id, eventId=event_id, body=body))
+        self._list_cache.clear()
+        return updated
 
     def delete_event(self, event_id: str, calendar_id: str = "primary") -> None:
         """Delete an event."""
-        service = self._get_service()
-        service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+        self._execute(self._get_events().delete(calendarId=calendar_id, eventId=event_id))
+        self._list_cache.clear()
 
     def quick_add(self, text: str, calendar_id: str = "primary") -> dict:
         """Create an event using natural language (e.g., 'Meeting tomorrow at 3pm')."""
+        created = self._execute(self._get_events().quickAdd(calendarId=calendar_id, text=text))
+        self._list_cache.clear()
+        return created
+
+    # Async variants (run the blocking client in a worker thread with its own transport)
+
+    async def alist_calendars(self) -> list[dict]:
+        """Async variant of list_calendars."""
+        return await asyncio.to_thread(self.list_calendars)
+
+    async def alist_events(
+        self,
+        calendar_id: str = "primary",
+        time_min: Optional[str] = None,
+        time_max: Optional[str] = None,
+        max_results: int = 250,
+        fields: Optional[str] = None,
+    ) -> list[dict]:
+        """Async variant of list_events."""
+        return await asyncio.to_thread(self.list_events, calendar_id, time_min, time_max, max_results, fields)
+
+    async def aget_event(self, event_id: str, calendar_id: str = "primary") -> dict:
+        """Async variant of get_event."""
+        return await asyncio.to_thread(self.get_event, event_id, calendar_id)
+
+    async def acreate_event(self, event: EventCreate, calendar_id: str = "primary") -> dict:
+        """Async variant of create_event."""
+        return await asyncio.to_thread(self.create_event, event, calendar_id)
+
+    async def aupdate_event(self, event_id: str, event: EventUpdate, calendar_id: str = "primary") -> dict:
+        """Async variant of update_event."""
+        return await asyncio.to_thread(self.update_event, event_id, event, calendar_id)
+
+    async def adelete_event(self, event_id: str, calendar_id: str = "primary") -> None:
+        """Async variant of delete_event."""
+        await asyncio.to_thread(self.delete_event, event_id, calendar_id)
+
+    async def aquick_add(self, text: str, calendar_id: str = "primary") -> dict:
+        """Async variant of quick_add."""
+        return await asyncio.to_thread(self.quick_add, text, calendar_id)
+
+    async def abatch_mutate_events(self, ops: list[tuple[str, dict]], calendar_id: str = "primary") -> list:
+        """Async variant of batch_mutate_events."""
+        return await asyncio.to_thread(self.batch_mutate_events, ops, calendar_id)
+
+    # Batch
+
+    def batch_mutate_events(self, ops: list[tuple[str, dict]], calendar_id: str = "primary") -> list:
+        """Apply many event mutations using batched HTTP requests.
+
+        Each op is (method, body) where method is "insert", "update", "patch" or "delete"
+        and body is a Calendar API event resource ("id" is required except for inserts).
+        Returns one result per op in order: the API response, or the exception for failed ops.
+        """
         service = self._get_service()
-        return service.events().quickAdd(calendarId=calendar_id, text=text).execute()
+        events = self._get_events()
+        results: list = [None] * len(ops)
+
+        def callback(request_id, response, exception):
+            results[int(request_id)] = exception if exception is not None else response
+
+        try:
+            for start in range(0, len(ops), BATCH_LIMIT):
+                batch = service.new_batch_http_request(callback=callback)
+                for i, (method, body) in enumerate(ops[start : start + BATCH_LIMIT], start):
+                    batch.add(self._event_request(events, method, body, calendar_id), request_id=str(i))
+                self._execute(batch)
+        finally:
+            # Earlier batches may have been applied even if a later one failed
+            self._list_cache.clear()
+        return results
+
+    def _event_request(self, events, method: str, body: dict, calendar_id: str):
+        """Build a single events() request for a batch op."""
+        if method == "insert":
+            return events.insert(calendarId=calendar_id, body=body)
+        if method in ("update", "patch"):
+            return getattr(events, method)(calendarId=calendar_id, eventId=body["id"], body=body)
+        if method == "delete":
+            return events.delete(calendarId=calendar_id, eventId=body["id"])
+        raise ValueError(f"Unknown batch method: {method}")
@@ -1,20 +1,25 @@
 """Google Tasks API service with CRUD operations."""
 
-from typing import Optional
-
-from googleapiclient.discovery import build
-from pydantic import BaseModel
+import asyncio
+from dataclasses import dataclass
+from typing import Iterator, Optional
 
 from szymon.services.google_auth import GoogleAuthService
+from szymon.services.list_cache import ListCache
+
+# The Tasks API accepts at most 1000 calls per batch request
+BATCH_LIMIT = 1000
 
 
-class TaskCreate(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class TaskCreate:
     title: str
     notes: Optional[str] = None
     due: Optional[str] = None  # RFC 3339 timestamp
 
 
-class TaskUpdate(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class TaskUpdate:
     title: Optional[str] = None
     notes: Optional[str] = None
     due: Optional[str] = None
@@ -24,16 +29,41 @@ class TaskUpdate(BaseModel):
 class GoogleTasksService:
     """Service for interacting with Google Tasks API."""
 
-    def __init__(self, auth_service: GoogleAuthService):
+    # Partial response covering what the web UI reads from a task list
+    DEFAULT_TASK_FIELDS = "items(id,title,notes,due,status,completed,parent,position,updated),nextPageToken"
+
+    def __init__(self, auth_service: GoogleAuthService, list_cache_ttl: float = 20):
         self.auth = auth_service
+        # Recent list_tasks results, cleared by any task mutation or re-auth; ttl of 0 disables it
+        self._list_cache = ListCache(ttl=list_cache_ttl)
+        auth_service.add_reauth_callback(self._list_cache.clear)
         self._service = None
+        self._tasks = None
+        self._tasklists = None
 
     def _get_service(self):
-        """Get or create the Tasks API service."""
-        if self._service is None:
-            creds = self.auth.get_credentials()
-            self._service = build("tasks", "v1", credentials=creds)
-        return self._service
+        """Get the Tasks API service (cached on the auth service)."""
+        service = self.auth.build_service("tasks", "v1")
+        # Resource collections are rebuilt only when the client itself changes
+        if service is not self._service:
+            self._tasks = service.tasks()
+            self._tasklists = service.tasklists()
+            self._service = service
+        return service
+
+    def _get_tasks(self):
+        """Get the tasks() collection of the current API service."""
+        self._get_service()
+        return self._tasks
+
+    def _get_tasklists(self):
+        """Get the tasklists() collection of the current API service."""
+        self._get_service()
+        return self._tasklists
+
+    def _execute(self, request):
+        """Execute an API request on this thread's transport."""
+        return request.execute(http=self.auth.get_http())
 
     def is_authenticated(self) -> bool:
         """Check if valid credentials exist."""
@@ -51,8 +81,7 @@ class GoogleTasksService:
 
     def list_task_lists(self, max_results: int = 100) -> list[dict]:
         """List all task lists."""
-        service = self._get_service()
-        results = service.tasklists().list(maxResults=max_results).execute()
+        results = self._execute(self._get_tasklists().list(maxResults=max_results))
         return results.get("items", [])
 
     def get_default_task_list_id(self) -> str:
@@ -67,62 +96,92 @@ class GoogleTasksService:
         max_results: int = 100,
         show_completed: bool = True,
         show_hidden: bool = True,
+        fields: Optional[str] = None,
     ) -> list[dict]:
-        """List all tasks in a task list."""
-        service = self._get_service()
-        results = (
-            service.tasks()
-            .list(
+        """List all tasks in a task list.
+
+        Pass `fields` (e.g. DEFAULT_TASK_FIELDS) to request a partial response.
+        """
+        key = (task_list_id, max_results, show_completed, show_hidden, fields)
+        items = self._list_cache.get(key)
+        if items is None:
+            request = self._get_tasks().list(
                 tasklist=task_list_id,
                 maxResults=max_results,
                 showCompleted=show_completed,
                 showHidden=show_hidden,
+                fields=fields,
             )
-            .execute()
+            items = self._execute(request).get("items", [])
+            self._list_cache.set(key, items)
+        return items
+
+    def iter_tasks(
+        self,
+        task_list_id: str = "@default",
+        page_size: int = 100,
+        show_completed: bool = True,
+        show_hidden: bool = True,
+        fields: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """Yield all tasks in a task list, fetching further pages lazily.
+
+        A custom `fields` projection must include nextPageToken.
+        """
+        tasks = self._get_tasks()
+        request = tasks.list(
+            tasklist=task_list_id,
+            maxResults=page_size,
+            showCompleted=show_completed,
+            showHidden=show_hidden,
+            fields=fields,
         )
-        return results.get("items", [])
+        while request is not None:
+            response = self._execute(request)
+            yield from response.get("items", [])
+            request = tasks.list_next(request, response)
 
     def get_task(self, task_id: str, task_list_id: str = "@default") -> dict:
         """Get a specific task by ID."""
-        service = self._get_service()
-        return service.tasks().get(tasklist=task_list_id, task=task_id).execute()
+        return self._execute(self._get_tasks().get(tasklist=task_list_id, task=task_id))
 
     def create_task(self, task: TaskCreate, task_list_id: str = "@default") -> dict:
         """Create a new task."""
-        service = self._get_service()
         body = {"title": task.title}
         if task.notes:
             body["notes"] = task.notes
         if task.due:
             body["due"] = task.due
-        return service.tasks().insert(tasklist=task_list_id, body=body).execute()
+        created = self._execute(self._get_tasks().insert(tasklist=task_list_id, body=body))
+        self._list_cache.clear()
+        return created
 
     def update_task(
         self, task_id: str, task: TaskUpdate, task_list_id: str = "@default"
     ) -> dict:
-        """Update an existing task."""
-        service = self._get_service()
-        existing = self.get_task(task_id, task_list_id)
+        """Update an existing task, sending only the changed fields."""
+        body = {}
 
         if task.title is not None:
-            existing["title"] = task.title
+            body["title"] = task.title
         if task.notes is not None:
-            existing["notes"] = task.notes
+            body["notes"] = task.notes
         if task.due is not None:
-            existing["due"] = task.due
+            body["due"] = task.due
         if task.status is not None:
-            existing["status"] = task.status
+            body["status"] = task.status
 
-        return (
-            service.tasks()
-            .update(tasklist=task_list_id, task=task_id, body=existing)
-            .execute()
-        )
+        if not body:
+            return self.get_task(task_id, task_list_id)
+
+        updated = self._execute(self._get_tasks().patch(tasklist=task_list_id, task=task_id, body=body))
+        self._list_cache.clear()
+        return updated
 
     def delete_task(self, task_id: str, task_list_id: str = "@default") -> None:
         """Delete a task."""
-        service = self._get_service()
-        service.tasks().delete(tasklist=task_list_id, task=task_id).execute()
+        self._execute(self._get_tasks().delete(tasklist=task_list_id, task=task_id))
+        self._list_cache.clear()
 
     def complete_task(self, task_id: str, task_list_id: str = "@default") -> dict:
         """Mark a task as completed."""
@@ -131,3 +190,87 @@ class GoogleTasksService:
     def uncomplete_task(self, task_id: str, task_list_id: str = "@default") -> dict:
         """Mark a task as not completed."""
         return self.update_task(task_id, TaskUpdate(status="needsAction"), task_list_id)
+
+    # Async variants (run the blocking client in a worker thread with its own transport)
+
+    async def alist_task_lists(self, max_results: int = 100) -> list[dict]:
+        """Async variant of list_task_lists."""
+        return await asyncio.to_thread(self.list_task_lists, max_results)
+
+    async def alist_tasks(
+        self,
+        task_list_id: str = "@default",
+        max_results: int = 100,
+        show_completed: bool = True,
+        show_hidden: bool = True,
+        fields: Optional[str] = None,
+    ) -> list[dict]:
+        """Async variant of list_tasks."""
+        return await asyncio.to_thread(
+            self.list_tasks, task_list_id, max_results, show_completed, show_hidden, fields
+        )
+
+    async def aget_task(self, task_id: str, task_list_id: str = "@default") -> dict:
+        """Async variant of get_task."""
+        return await asyncio.to_thread(self.get_task, task_id, task_list_id)
+
+    async def acreate_task(self, task: TaskCreate, task_list_id: str = "@default") -> dict:
+        """Async variant of create_task."""
+        return await asyncio.to_thread(self.create_task, task, task_list_id)
+
+    async def aupdate_task(self, task_id: str, task: TaskUpdate, task_list_id: str = "@default") -> dict:
+        """Async variant of update_task."""
+        return await asyncio.to_thread(self.update_task, task_id, task, task_list_id)
+
+    async def adelete_task(self, task_id: str, task_list_id: str = "@default") -> None:
+        """Async variant of delete_task."""
+        await asyncio.to_thread(self.delete_task, task_id, task_list_id)
+
+    async def acomplete_task(self, task_id: str, task_list_id: str = "@default") -> dict:
+        """Async variant of complete_task."""
+        return await asyncio.to_thread(self.complete_task, task_id, task_list_id)
+
+    async def auncomplete_task(self, task_id: str, task_list_id: str = "@default") -> dict:
+        """Async variant of uncomplete_task."""
+        return await asyncio.to_thread(self.uncomplete_task, task_id, task_list_id)
+
+    async def abatch_mutate_tasks(self, ops: list[tuple[str, dict]], task_list_id: str = "@default") -> list:
+        """Async variant of batch_mutate_tasks."""
+        return await asyncio.to_thread(self.batch_mutate_tasks, ops, task_list_id)
+
+    # Batch
+
+    def batch_mutate_tasks(self, ops: list[tuple[str, dict]], task_list_id: str = "@default") -> list:
+        """Apply many task mutations using batched HTTP requests.
+
+        Each op is (method, body) where method is "insert", "update", "patch" or "delete"
+        and body is a Tasks API task resource ("id" is required except for inserts).
+        Returns one result per op in order: the API response, or the exception for failed ops.
+        """
+        service = self._get_service()
+        tasks = self._get_tasks()
+        results: list = [None] * len(ops)
+
+        def callback(request_id, response, exception):
+            results[int(request_id)] = exception if exception is not None else response
+
+        try:
+            for start in range(0, len(ops), BATCH_LIMIT):
+                batch = service.new_batch_http_request(callback=callback)
+                for i, (method, body) in enumerate(ops[start : start + BATCH_LIMIT], start):
+                    batch.add(self._task_request(tasks, method, body, task_list_id), request_id=str(i))
+                self._execute(batch)
+        finally:
+            # Earlier batches may have been applied even if a later one failed
+            self._list_cache.clear()
+        return results
+
+    def _task_request(self, tasks, method: str, body: dict, task_list_id: str):
+        """Build a single tasks() request for a batch op."""
+        if method == "insert":
+            return tasks.insert(tasklist=task_list_id, body=body)
+        if method in ("update", "patch"):
+            return getattr(tasks, method)(tasklist=task_list_id, task=body["id"], body=body)
+        if method == "delete":
+            return tasks.delete(tasklist=task_list_id, task=body["id"])
+        raise ValueError(f"Unknown batch method: {method}")
@@ -0,0 +1,35 @@
+"""Short-lived, thread-safe cache for API list results."""
+
+import threading
+from typing import Hashable, Optional
+
+from cachetools import TTLCache
+
+
+class ListCache:
+    """TTL cache for list results, cleared wholesale on writes. A ttl of 0 disables it."""
+
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl) if ttl > 0 else None
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[list]:
+        """Get a cached result, or None if missing or expired."""
+        if self._cache is None:
+            return None
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: Hashable, value: list) -> None:
+        """Store a result."""
+        if self._cache is None:
+            return
+        with self._lock:
+            self._cache[key] = value
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        if self._cache is None:
+            return
+        with self._lock:
+            self._cache.clear()